@@ -1,19 +1,24 @@
-import json
-from collections import Counter
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
 
-with open('available-seats.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+with open('available-seats.json', 'rb') as f:
+    data = loads(f.read())
 
-all_seats = []
+# One pass: only seats seen more than once get a count entry
+seen = set()
+duplicates = {}
 for seats in data.values():
-    all_seats.extend(seats)
-
-seat_counts = Counter(all_seats)
-duplicates = [seat for seat, count in seat_counts.items() if count > 1]
+    for seat in seats:
+        if seat in seen:
+            duplicates[seat] = duplicates.get(seat, 1) + 1
+        else:
+            seen.add(seat)
 
 if duplicates:
     print('Duplicate seats found:')
-    for seat in duplicates:
-        print(f'{seat} (count: {seat_counts[seat]})')
+    for seat, count in duplicates.items():
+        print(f'{seat} (count: {count})')
 else:
     print('No duplicate seats found.')
@@ -1,7 +1,10 @@
-import json
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
 
-with open("available-seats.json", "r") as file:
-    data: dict = json.load(file)
+with open("available-seats.json", "rb") as file:
+    data: dict = loads(file.read())
 
 total_seats = 0
 
@@ -1,10 +1,90 @@
 import csv  # Added
 import json  # Added
-from collections import OrderedDict
+import sys
+from collections import Counter, deque, namedtuple
 from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+
+try:
+    import orjson  # Optional: faster JSON parsing when installed
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Buffer size for CSV file I/O; large enough that a whole roster is one read/write
+IO_BUFFER_SIZE = 1024 * 1024
+
+# One assigned (or preserved) seat; lighter than a dict per seat
+SeatInfo = namedtuple(
+    "SeatInfo",
+    "seat_number member_name ticket_holder_name pickup_method timestamp ts_str",
+)
+
+# One row of preserved-seats.csv
+PreservedSeat = namedtuple(
+    "PreservedSeat",
+    "block seat_number member_name ticket_holder_name pickup_method"
+    " allocation_time allocation_time_str",
+)
+
+# One audience request from audiences.csv
+AudienceRequest = namedtuple(
+    "AudienceRequest",
+    "timestamp ts_str member_name ticket_holder_name num_tickets pickup_method"
+    " original_row_num",
+)
+
+
+def _parse_timestamp_fast(ts_str):
+    """
+    Parses the two known timestamp layouts by splitting and calling int()
+    directly, skipping strptime's format interpretation.
+    Raises ValueError for anything it does not recognise.
+    """
+    parts = ts_str.split(" ")
+    if len(parts) == 3:
+        date_part, ampm_indicator, time_part = parts
+        if ampm_indicator not in ("上午", "下午"):
+            raise ValueError(f"unknown AM/PM indicator: '{ts_str}'")
+    elif len(parts) == 2:
+        date_part, time_part = parts
+        ampm_indicator = None
+    else:
+        raise ValueError(f"unexpected timestamp layout: '{ts_str}'")
+
+    date_fields = date_part.split("/")
+    time_fields = time_part.split(":")
+    # Accept only what strptime would: ASCII digits, a 4-digit year and 1-2
+    # digits elsewhere (int() alone also takes signs, padding and non-ASCII digits)
+    if (
+        len(date_fields) != 3
+        or len(time_fields) != 3
+        or len(date_fields[0]) != 4
+        or not all(
+            field.isascii() and field.isdigit()
+            for field in date_fields + time_fields
+        )
+        or any(len(field) > 2 for field in date_fields[1:] + time_fields)
+    ):
+        raise ValueError(f"unexpected timestamp fields: '{ts_str}'")
+
+    year, month, day = map(int, date_fields)
+    hour, minute, second = map(int, time_fields)
+    if ampm_indicator is not None:
+        if not 1 <= hour <= 12:
+            raise ValueError(f"12-hour clock value out of range: '{ts_str}'")
+        hour %= 12  # 12 o'clock is midnight unless it is 下午
+        if ampm_indicator == "下午":
+            hour += 12
+    return datetime(year, month, day, hour, minute, second)
 
 
 # Helper function to parse timestamps from the CSV
+# Rows submitted in the same second share a timestamp; bounded so a huge file
+# of unique timestamps cannot grow the cache without limit
+@lru_cache(maxsize=4096)
 def parse_timestamp(ts_str):
     """
     Parses a timestamp string in various possible formats
@@ -20,6 +100,11 @@ def parse_timestamp(ts_str):
     ):  # Added check for placeholder strings
         return None  # Return None for empty or placeholder strings
 
+    try:
+        return _parse_timestamp_fast(ts_str)
+    except ValueError:
+        pass  # Unusual layout; let the strptime-based attempts below decide
+
     try:
         # Attempt 1: Parse with Chinese AM/PM
         date_part, time_with_ampm = ts_str.split(" ", 1)
@@ -50,39 +135,115 @@ def parse_timestamp(ts_str):
         return datetime.max  # Return datetime.max if all parsing attempts fail
 
 
+@lru_cache(maxsize=4096)  # Every seat of a request or preserved group shares a time
+def format_timestamp(dt):
+    """
+    Formats a datetime as 'YYYY/MM/DD HH:MM:SS' without going through
+    strftime. Returns an empty string for None.
+    """
+    if dt is None:
+        return ""
+    return (
+        f"{dt.year:04d}/{dt.month:02d}/{dt.day:02d} "
+        f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+    )
+
+
+# Only a handful of distinct block names exist, so both directions of the
+# "Block N" <-> "block-N" translation are cached instead of rebuilt per row
+@lru_cache(maxsize=None)
+def normalize_block_name(display_name):
+    """Converts a display name like 'Block 1' to the key 'block-1'."""
+    return display_name.strip().replace("Block ", "block-")
+
+
+@lru_cache(maxsize=None)
+def display_block_name(block_name):
+    """Converts a key like 'block-1' to the display name 'Block 1'."""
+    return block_name.replace("block-", "Block ")
+
+
 def load_available_seats(filepath="available-seats.json"):  # Changed default filename
     """Loads available seats from a JSON file."""  # Updated docstring
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)  # Use json.load
-
-        # Sort block names by the number in their name (e.g., "block-1", "block-2")
-        sorted_block_names = sorted(data.keys(), key=lambda k: int(k.split("-")[1]))
+        with open(filepath, "rb") as f:
+            data = _json_loads(f.read())
+
+        # Sort block names by the number in their name (e.g., "block-1", "block-2"),
+        # decorating each name with its number once instead of per comparison.
+        # Names without a trailing number keep their file order after the rest.
+        numbered_blocks = []
+        unnumbered_blocks = []
+        for block_name in data:
+            try:
+                numbered_blocks.append((int(block_name.rsplit("-", 1)[-1]), block_name))
+            except ValueError:
+                unnumbered_blocks.append(block_name)
+        numbered_blocks.sort()
+        sorted_block_names = [name for _, name in numbered_blocks] + unnumbered_blocks
+        if unnumbered_blocks:
+            print(
+                f"Warning: Block names without a number in '{filepath}' are placed last: {', '.join(unnumbered_blocks)}"
+            )
 
-        available_seats_ordered = OrderedDict()
+        available_seats_ordered = {}
         for block_name in sorted_block_names:
-            available_seats_ordered[block_name] = list(
+            available_seats_ordered[block_name] = deque(
                 data[block_name]
-            )  # Ensure it's a list
+            )  # deque gives O(1) popleft when assigning seats
         return available_seats_ordered
     except FileNotFoundError:
         print(f"Error: File '{filepath}' not found.")
-        return OrderedDict()
+        return {}
     except Exception as e:
         print(f"Error: An error occurred while loading or parsing '{filepath}': {e}")
-        return OrderedDict()
+        return {}
 
 
 def load_preserved_seats(filepath="preserved-seats.csv"):
     """Loads preserved seat assignments from a CSV file."""
     preserved = []
     try:
-        with open(filepath, "r", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(f)
+        with open(
+            filepath, "r", encoding="utf-8-sig", buffering=IO_BUFFER_SIZE
+        ) as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return preserved  # Empty file
+
+            # Resolve column positions once; optional columns map to None
+            try:
+                idx_block = header.index("Block")
+                idx_seat_number = header.index("Seat Number")
+                idx_ticket_holder = header.index("Ticket Holder Name")
+            except ValueError as e:
+                print(
+                    f"Error: Missing required column in '{filepath}': {e} (header: {header})"
+                )
+                return []
+            idx_member_name = (
+                header.index("Member Name") if "Member Name" in header else None
+            )
+            idx_pickup_method = (
+                header.index("Pickup Method") if "Pickup Method" in header else None
+            )
+            idx_allocation_time = (
+                header.index("Allocation Time") if "Allocation Time" in header else None
+            )
+
             for row in reader:
+                if not row:
+                    continue  # Blank line
+                # Nearly every column is used, so strip them all in one pass
+                cells = [cell.strip() for cell in row]
                 try:
                     # Allocation Time might be empty if it's from an older export or manually created
-                    timestamp_str = row.get("Allocation Time", "").strip()
+                    timestamp_str = (
+                        cells[idx_allocation_time]
+                        if idx_allocation_time is not None
+                        else ""
+                    )
                     alloc_time = (
                         parse_timestamp(timestamp_str)
                         if timestamp_str
@@ -90,20 +251,27 @@ def load_preserved_seats(filepath="preserved-seats.csv"):
                     )
 
                     preserved.append(
-                        {
-                            "block": row["Block"]
-                            .strip()
-                            .replace("Block ", "block-"),  # Normalize block name
-                            "seat_number": row["Seat Number"].strip(),
-                            "member_name": row.get("Member Name", "").strip(),
-                            "ticket_holder_name": row["Ticket Holder Name"].strip(),
-                            "pickup_method": row.get("Pickup Method", "").strip(),
-                            "allocation_time": alloc_time,  # Store as datetime or None
-                        }
+                        PreservedSeat(
+                            block=normalize_block_name(cells[idx_block]),
+                            seat_number=cells[idx_seat_number],
+                            member_name=(
+                                cells[idx_member_name]
+                                if idx_member_name is not None
+                                else ""
+                            ),
+                            ticket_holder_name=cells[idx_ticket_holder],
+                            pickup_method=(
+                                cells[idx_pickup_method]
+                                if idx_pickup_method is not None
+                                else ""
+                            ),
+                            allocation_time=alloc_time,  # Store as datetime or None
+                            allocation_time_str=format_timestamp(alloc_time),
+                        )
                     )
-                except KeyError as e:
+                except IndexError:
                     print(
-                        f"Warning: Skipping row in '{filepath}' due to missing column: {e} (Row: {row})"
+                        f"Warning: Skipping row in '{filepath}' due to insufficient columns: {row}"
                     )
                 except (
                     ValueError
@@ -127,32 +295,59 @@ def load_audience_requests(filepath="audiences.csv"):
     requests = []
     try:
         with open(
-            filepath, "r", encoding="utf-8-sig"
+            filepath, "r", encoding="utf-8-sig", buffering=IO_BUFFER_SIZE
         ) as f:  # Use utf-8-sig to handle potential BOM
-            reader = csv.DictReader(f)  # Use DictReader
-            # No need to skip header manually, DictReader handles it.
-
-            # Define expected header names for clarity and validation (optional)
-            # expected_headers = ["時間戳記", "您的身分是", "索票人姓名", "票券張數", "團員姓名", "取票人姓名", "索票方式"]
-            # actual_headers = reader.fieldnames
-            # if not all(header in actual_headers for header in expected_headers):
-            #     print(f"Warning: CSV headers do not match expected. Found: {actual_headers}")
-            #     # Decide if you want to proceed or raise an error
+            reader = csv.reader(f)
+            header = next(reader, [])
+
+            # Resolve the columns we use once; rows are then read by position
+            try:
+                idx_timestamp = header.index("時間戳記")
+                idx_member_name = header.index("團員姓名")
+                idx_ticket_holder = header.index("取票人姓名")
+                idx_num_tickets = header.index("票券張數")
+                idx_pickup_method = header.index("索票方式")
+            except ValueError as e:
+                print(
+                    f"Error: Missing required column in '{filepath}': {e} (header: {header})"
+                )
+                return []
+            min_columns = (
+                max(
+                    idx_timestamp,
+                    idx_member_name,
+                    idx_ticket_holder,
+                    idx_num_tickets,
+                    idx_pickup_method,
+                )
+                + 1
+            )
+            # Pulls the five columns we use out of a row in one C-level call
+            get_columns = itemgetter(
+                idx_timestamp,
+                idx_member_name,
+                idx_ticket_holder,
+                idx_num_tickets,
+                idx_pickup_method,
+            )
 
-            for i, row in enumerate(reader):
+            # Blank lines are skipped (as DictReader did) so row numbers stay the same
+            for i, row in enumerate(row for row in reader if row):
+                if len(row) < min_columns:
+                    print(
+                        f"Warning: Skipping row {i + 2} due to insufficient columns (file {filepath}): {row}"
+                    )
+                    continue
                 try:
-                    # Access columns by name
-                    timestamp_str = row["時間戳記"].strip()
-                    member_name = row[
-                        "團員姓名"
-                    ].strip()  # Corrected column name based on audiences.csv
-                    ticket_holder_name = row[
-                        "取票人姓名"
-                    ].strip()  # Corrected column name
-                    if not ticket_holder_name:
-                        ticket_holder_name = member_name
-
-                    num_tickets_str = row["票券張數"].strip()  # Corrected column name
+                    (
+                        timestamp_str,
+                        member_name,
+                        ticket_holder_name,
+                        num_tickets_str,
+                        pickup_method,
+                    ) = get_columns(row)
+
+                    num_tickets_str = num_tickets_str.strip()
                     if not num_tickets_str:
                         num_tickets = 0
                     else:
@@ -161,33 +356,34 @@ def load_audience_requests(filepath="audiences.csv"):
                     if num_tickets <= 0:
                         continue
 
-                    pickup_method = row["索票方式"].strip()
+                    # Only rows that actually request tickets get the rest stripped
+                    member_name = member_name.strip()
+                    ticket_holder_name = ticket_holder_name.strip()
+                    if not ticket_holder_name:
+                        ticket_holder_name = member_name
+                    pickup_method = pickup_method.strip()
+                    # A blank or placeholder timestamp sorts last, like an unparseable one,
+                    # so the attrgetter sort below never compares None
+                    timestamp = parse_timestamp(timestamp_str.strip()) or datetime.max
 
                     requests.append(
-                        {
-                            "timestamp": parse_timestamp(timestamp_str),
-                            "member_name": member_name,
-                            "ticket_holder_name": ticket_holder_name,
-                            "num_tickets": num_tickets,
-                            "pickup_method": pickup_method,
-                            "original_row_num": i
-                            + 2,  # For debugging (i+1 for DictReader header, +1 for 1-based)
-                        }
+                        AudienceRequest(
+                            timestamp=timestamp,
+                            ts_str=format_timestamp(timestamp),  # Formatted once per request
+                            member_name=member_name,
+                            ticket_holder_name=ticket_holder_name,
+                            num_tickets=num_tickets,
+                            pickup_method=pickup_method,
+                            original_row_num=i
+                            + 2,  # For debugging (i+1 for the header row, +1 for 1-based)
+                        )
                     )
                 except ValueError as e:
                     print(
                         f"Warning: Skipping row {i + 2} due to data conversion error (file {filepath}): {e} (original data: {row})"
                     )
-                except KeyError as e:
-                    print(
-                        f"Warning: Skipping row {i + 2} due to missing column (file {filepath}): {e} (original data: {row})"
-                    )
-                except IndexError:  # Should be less likely with DictReader unless rows are truly malformed
-                    print(
-                        f"Warning: Skipping row {i + 2} due to insufficient columns (file {filepath}): {row}"
-                    )
 
-        requests.sort(key=lambda r: r["timestamp"])
+        requests.sort(key=attrgetter("timestamp"))
         return requests
     except FileNotFoundError:
         print(f"Error: File '{filepath}' not found.")
@@ -197,87 +393,160 @@ def load_audience_requests(filepath="audiences.csv"):
         return []
 
 
+def build_capacity_tree(capacities):
+    """
+    Builds a max segment tree over block capacities so the first block with
+    at least k free seats can be found in O(log B). Returns (tree, leaf_count).
+    """
+    leaf_count = 1
+    while leaf_count < len(capacities):
+        leaf_count *= 2
+    tree = [0] * (2 * leaf_count)
+    tree[leaf_count : leaf_count + len(capacities)] = capacities
+    for node in range(leaf_count - 1, 0, -1):
+        tree[node] = max(tree[2 * node], tree[2 * node + 1])
+    return tree, leaf_count
+
+
+def find_first_fit(tree, leaf_count, needed):
+    """Returns the index of the first block with at least `needed` seats, or -1."""
+    if tree[1] < needed:
+        return -1
+    node = 1
+    while node < leaf_count:
+        node *= 2
+        if tree[node] < needed:
+            node += 1  # Left subtree cannot fit; the right one must
+    return node - leaf_count
+
+
+def update_capacity(tree, leaf_count, block_idx, capacity):
+    """Sets a block's capacity and refreshes the maxima above it."""
+    node = leaf_count + block_idx
+    tree[node] = capacity
+    node //= 2
+    while node:
+        tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        node //= 2
+
+
 def assign_seats(
     audience_requests, available_seats_ordered, preserved_seats=None
 ):  # Added preserved_seats
     """Assigns seats to audience requests, considering preserved seats."""
-    assigned_seats_by_block = OrderedDict()
+    assigned_seats_by_block = {}
+    # Diagnostics are collected and written once at the end, as in
+    # format_and_print_results
+    messages = []
     for block_name_key_init in available_seats_ordered.keys():
         assigned_seats_by_block[block_name_key_init] = []
 
     # Step 1: Account for preserved seats - remove from available and add to final assignments
-    # Build a set of (block, seat_number) for quick lookup
-    preserved_seat_set = set()
+    # Free seats of each touched block as a set, so membership and removal are
+    # O(1); the block's deque is rebuilt from it once all preserved seats are seen
+    free_seats_by_block = {}
     if preserved_seats:
         for ps in preserved_seats:
-            block_name = ps["block"]
-            seat_num = ps["seat_number"]
-            preserved_seat_set.add((block_name, seat_num))
-            # Add to assigned_seats_by_block to include in output
-            assigned_seats_by_block.setdefault(block_name, []).append(
-                {
-                    "seat_number": seat_num,
-                    "member_name": ps["member_name"],
-                    "ticket_holder_name": ps["ticket_holder_name"],
-                    "pickup_method": ps["pickup_method"],
-                    "timestamp": ps["allocation_time"],
-                }
+            block_name = ps.block
+            seat_num = ps.seat_number
+            # Add to assigned_seats_by_block to include in output; blocks missing
+            # from the available seats get their list here (no setdefault list per seat)
+            block_assignments = assigned_seats_by_block.get(block_name)
+            if block_assignments is None:
+                block_assignments = assigned_seats_by_block[block_name] = []
+            block_assignments.append(
+                SeatInfo(
+                    seat_num,
+                    ps.member_name,
+                    ps.ticket_holder_name,
+                    ps.pickup_method,
+                    ps.allocation_time,
+                    ps.allocation_time_str,
+                )
             )
             # Remove from available_seats_ordered
             if block_name in available_seats_ordered:
-                if seat_num in available_seats_ordered[block_name]:
-                    available_seats_ordered[block_name].remove(seat_num)
+                free_seats = free_seats_by_block.get(block_name)
+                if free_seats is None:
+                    free_seats = free_seats_by_block[block_name] = set(
+                        available_seats_ordered[block_name]
+                    )
+                if seat_num in free_seats:
+                    free_seats.remove(seat_num)
                 else:
-                    print(
+                    messages.append(
                         f"Warning: Preserved seat {seat_num} in {block_name} not found in available seat list for that block. It might have been removed or changed, or block name mismatch."
                     )
             else:
-                print(
+                messages.append(
                     f"Warning: Block {block_name} for preserved seat {seat_num} not found in available seat blocks."
                 )
 
+    for block_name, free_seats in free_seats_by_block.items():
+        available_seats_ordered[block_name] = deque(
+            seat for seat in available_seats_ordered[block_name] if seat in free_seats
+        )
+
     unassigned_requests = []
 
+    # Seats held per ticket holder (preserved plus newly assigned), kept up to
+    # date below instead of rescanning every assignment for each request
+    seats_held_by_holder = Counter(
+        ps.ticket_holder_name for ps in preserved_seats or ()
+    )
+
+    # Index blocks by position so the request loop avoids string-keyed lookups.
+    # These are the same deque/list objects held by the dicts, so the dicts
+    # returned below stay in sync.
+    seat_queues = list(available_seats_ordered.values())
+    assigned_lists = [
+        assigned_seats_by_block[block_name] for block_name in available_seats_ordered
+    ]
+    capacity_tree, leaf_count = build_capacity_tree(
+        [len(seats) for seats in seat_queues]
+    )
+
     # Step 2: Process audience requests
     for request in audience_requests:
-        num_tickets_needed = request["num_tickets"]
-        request_holder_name = request["ticket_holder_name"]
-        request_timestamp = request["timestamp"]
+        num_tickets_needed = request.num_tickets
+        request_holder_name = request.ticket_holder_name
+        request_timestamp = request.timestamp
+        request_ts_str = request.ts_str
 
         # Check if enough seats for this request are already preserved (by seat number)
-        preserved_count = 0
-        for block_name, assignments in assigned_seats_by_block.items():
-            for assignment in assignments:
-                if assignment["ticket_holder_name"] == request_holder_name:
-                    preserved_count += 1
-        if preserved_count >= num_tickets_needed:
-            print(
+        if seats_held_by_holder[request_holder_name] >= num_tickets_needed:
+            messages.append(
                 f"Info: Request for {request_holder_name} ({num_tickets_needed} tickets) is covered by preserved seats. Skipping new assignment."
             )
             continue
 
-        # If not fulfilled by preserved, proceed with normal assignment logic
-        assigned_for_this_request_newly = False
-        for block_name, seats_in_block in available_seats_ordered.items():
-            if len(seats_in_block) >= num_tickets_needed:
-                temp_assigned_seats_info = []
-                for _ in range(num_tickets_needed):
-                    seat = seats_in_block.pop(0)
-                    seat_info = {
-                        "seat_number": seat,
-                        "member_name": request["member_name"],
-                        "ticket_holder_name": request_holder_name,
-                        "pickup_method": request["pickup_method"],
-                        "timestamp": request_timestamp,
-                    }
-                    temp_assigned_seats_info.append(seat_info)
-                assigned_seats_by_block.setdefault(block_name, []).extend(
-                    temp_assigned_seats_info
-                )
-                assigned_for_this_request_newly = True
-                break
-        if not assigned_for_this_request_newly:
+        # If not fulfilled by preserved, proceed with normal assignment logic:
+        # first-fit into the earliest block that can seat the whole request
+        block_idx = find_first_fit(capacity_tree, leaf_count, num_tickets_needed)
+        if block_idx < 0:
             unassigned_requests.append(request)
+            continue
+
+        request_member_name = request.member_name
+        request_pickup_method = request.pickup_method
+        seats_in_block = seat_queues[block_idx]
+        # Seats go straight from the block's deque into its assignment list
+        assigned_lists[block_idx].extend(
+            SeatInfo(
+                seats_in_block.popleft(),
+                request_member_name,
+                request_holder_name,
+                request_pickup_method,
+                request_timestamp,
+                request_ts_str,
+            )
+            for _ in range(num_tickets_needed)
+        )
+        seats_held_by_holder[request_holder_name] += num_tickets_needed
+        update_capacity(capacity_tree, leaf_count, block_idx, len(seats_in_block))
+
+    if messages:
+        sys.stdout.write("\n".join(messages) + "\n")
 
     return assigned_seats_by_block, unassigned_requests, available_seats_ordered
 
@@ -286,56 +555,58 @@ def format_and_print_results(
     assigned_seats_by_block, unassigned_requests, remaining_seats_by_block
 ):
     """Formats and prints the seating assignment results."""
-    print("--- Seating Assignment Results ---")
+    # Collect all lines and write them in one call instead of one print per seat
+    out = ["--- Seating Assignment Results ---"]
     any_seat_assigned = False
     for block_name, assignments in assigned_seats_by_block.items():
         if not assignments:
             continue
         any_seat_assigned = True
-        block_display_name = block_name.replace("block-", "Block ")
-        print(f"\n{block_display_name} ======")
+        block_display_name = display_block_name(block_name)
+        out.append(f"\n{block_display_name} ======")
         for assignment in assignments:
-            output_str = f"{assignment['seat_number']}: "
+            output_str = f"{assignment.seat_number}: "
 
-            if assignment["member_name"]:
-                output_str += f"Member: {assignment['member_name']} "
+            if assignment.member_name:
+                output_str += f"Member: {assignment.member_name} "
 
-            output_str += f"Ticket Holder: {assignment['ticket_holder_name']}"
+            output_str += f"Ticket Holder: {assignment.ticket_holder_name}"
 
-            if assignment["pickup_method"]:
-                output_str += f" Pickup Method: {assignment['pickup_method']}"
+            if assignment.pickup_method:
+                output_str += f" Pickup Method: {assignment.pickup_method}"
 
-            if "timestamp" in assignment and assignment["timestamp"]:
-                ts_str = assignment["timestamp"].strftime("%Y/%m/%d %H:%M:%S")
-                output_str += f" Allocation Time: {ts_str}"
+            if assignment.ts_str:
+                output_str += f" Allocation Time: {assignment.ts_str}"
 
-            print(output_str)
+            out.append(output_str)
 
     if not any_seat_assigned and not unassigned_requests:
-        print(
+        out.append(
             "No seats were assigned, and no unassigned requests (possibly all requests were for 0 tickets or no valid requests/seats)."
         )
     elif not any_seat_assigned and unassigned_requests:
-        print("No seats were successfully assigned.")
+        out.append("No seats were successfully assigned.")
 
     if unassigned_requests:
-        print("\n--- Requests That Could Not Be Seated ---")
+        out.append("\n--- Requests That Could Not Be Seated ---")
         for req in unassigned_requests:
-            print(
-                f"- Ticket Holder: {req['ticket_holder_name']}, Tickets: {req['num_tickets']}, Time: {req['timestamp'].strftime('%Y/%m/%d %H:%M:%S')} (Original CSV Row: {req.get('original_row_num', 'N/A')})"
+            out.append(
+                f"- Ticket Holder: {req.ticket_holder_name}, Tickets: {req.num_tickets}, Time: {req.ts_str} (Original CSV Row: {req.original_row_num})"
             )
 
-    print("\n--- Remaining Available Seats ---")
+    out.append("\n--- Remaining Available Seats ---")
     total_remaining_seats = 0
     if remaining_seats_by_block:
         for block_name, seats in remaining_seats_by_block.items():
             count = len(seats)
             total_remaining_seats += count
-            block_display_name = block_name.replace("block-", "Block ")
-            print(f"{block_display_name}: {count} seat(s) remaining")
-        print(f"\nTotal remaining seats: {total_remaining_seats}")
+            block_display_name = display_block_name(block_name)
+            out.append(f"{block_display_name}: {count} seat(s) remaining")
+        out.append(f"\nTotal remaining seats: {total_remaining_seats}")
     else:
-        print("No remaining seats information available (or all seats taken).")
+        out.append("No remaining seats information available (or all seats taken).")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def main():
@@ -399,7 +670,9 @@ def main():
 def export_results_to_csv(assigned_seats_by_block, unassigned_requests, filename):
     """Exports the seating results to a CSV file."""
     try:
-        with open(filename, "w", newline="", encoding="utf-8-sig") as csvfile:
+        with open(
+            filename, "w", newline="", encoding="utf-8-sig", buffering=IO_BUFFER_SIZE
+        ) as csvfile:
             fieldnames = [
                 "Block",
                 "Seat Number",
@@ -409,49 +682,46 @@ def export_results_to_csv(assigned_seats_by_block, unassigned_requests, filename
                 "Pickup Method",
                 "Allocation Time",  # Ensure this is the correct header for your needs
             ]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
+            writer = csv.writer(csvfile)
+            writer.writerow(fieldnames)
+
+            # Rows are tuples in fieldnames order, streamed to writerows from
+            # generators so the whole roster is never materialized at once
 
-            # Write assigned seats (includes new and preserved)
+            # Assigned seats (includes new and preserved)
             for block_name, assignments in assigned_seats_by_block.items():
-                block_display_name = block_name.replace("block-", "Block ")
-                for assignment in assignments:
-                    alloc_time_str = ""
-                    timestamp = assignment.get("timestamp")
-                    # Check if timestamp is None or datetime.max (our error placeholder)
-                    if timestamp and timestamp != datetime.max:
-                        alloc_time_str = timestamp.strftime("%Y/%m/%d %H:%M:%S")
-                    elif timestamp == datetime.max:
-                        alloc_time_str = (
+                block_display_name = display_block_name(block_name)
+                writer.writerows(
+                    (
+                        block_display_name,
+                        assignment.seat_number,
+                        assignment.member_name,
+                        assignment.ticket_holder_name,
+                        1,  # Each assigned row is 1 ticket
+                        assignment.pickup_method,
+                        # datetime.max is our error placeholder; ts_str is "" for None
+                        (
                             "Invalid Timestamp in Source"  # Or "" if you prefer
-                        )
-
-                    writer.writerow(
-                        {
-                            "Block": block_display_name,
-                            "Seat Number": assignment["seat_number"],
-                            "Member Name": assignment.get("member_name", ""),
-                            "Ticket Holder Name": assignment["ticket_holder_name"],
-                            "Number of Tickets": 1,  # Each assigned row is 1 ticket
-                            "Pickup Method": assignment.get("pickup_method", ""),
-                            "Allocation Time": alloc_time_str,
-                        }
+                            if assignment.timestamp == datetime.max
+                            else assignment.ts_str
+                        ),
                     )
+                    for assignment in assignments
+                )
 
-            # Write unassigned requests
-            if unassigned_requests:
-                for req in unassigned_requests:
-                    writer.writerow(  # Added writerow for unassigned requests
-                        {
-                            "Block": "N/A (Unassigned)",
-                            "Seat Number": "N/A",
-                            "Member Name": req.get("member_name", ""),
-                            "Ticket Holder Name": req["ticket_holder_name"],
-                            "Number of Tickets": req["num_tickets"],
-                            "Pickup Method": req.get("pickup_method", ""),
-                            "Allocation Time": "N/A (Unassigned)",  # Or req['timestamp'] if you want request time
-                        }
-                    )
+            # Unassigned requests
+            writer.writerows(
+                (
+                    "N/A (Unassigned)",
+                    "N/A",
+                    req.member_name,
+                    req.ticket_holder_name,
+                    req.num_tickets,
+                    req.pickup_method,
+                    "N/A (Unassigned)",  # Or req['timestamp'] if you want request time
+                )
+                for req in unassigned_requests
+            )
     except IOError:
         print(
             f"Error: Could not write to file '{filename}'. Please check permissions or path."
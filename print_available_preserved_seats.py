@@ -1,35 +1,36 @@
 import csv
 import json
+from collections import Counter
+from itertools import chain
 
 # Read available-seats.json
 with open("available-seats.json", encoding="utf-8") as f:
     available = json.load(f)
 
-# Check for duplicate seat numbers in available-seats.json
-seen = set()
-duplicates = set()
-for seats in available.values():
-    for seat in seats:
-        if seat in seen:
-            duplicates.add(seat)
-        else:
-            seen.add(seat)
-if duplicates:
+# Flatten all available seat numbers into a set (built in C)
+available_seats = set(chain.from_iterable(available.values()))
+
+# Check for duplicate seat numbers in available-seats.json; only when the set
+# is smaller than the total seat count is there anything to look for
+if len(available_seats) != sum(map(len, available.values())):
+    seat_counts = Counter(chain.from_iterable(available.values()))
+    duplicates = [seat for seat, count in seat_counts.items() if count > 1]
     raise ValueError(
         f"Duplicate seat numbers found in available-seats.json: {', '.join(sorted(duplicates))}"
     )
 
-# Flatten all available seat numbers into a set
-available_seats = seen
-
 # Read preserved-seats.csv and collect all preserved seat numbers
-preserved_seats = set()
 with open("preserved-seats.csv", encoding="utf-8") as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        preserved_seats.add(row["Seat Number"])
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        preserved_seats = set()  # Empty file
+    else:
+        seat_number_idx = header.index("Seat Number")
+        preserved_seats = {
+            row[seat_number_idx] for row in reader if len(row) > seat_number_idx
+        }
 
 # Print all available seats that are not preserved
-for seat in sorted(available_seats):
-    if seat not in preserved_seats:
-        print(f"Available (not preserved) seat: {seat}")
+for seat in sorted(available_seats - preserved_seats):
+    print(f"Available (not preserved) seat: {seat}")